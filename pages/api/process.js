@@ -32,7 +32,8 @@ export default async function handler(req, res) {
       pythonScript,
       inputPath,
       '-o',
-      outputPath
+      outputPath,
+      '--verbose'
     ]);
 
     let output = '';
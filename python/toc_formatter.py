@@ -8,34 +8,175 @@ Also formats abbreviation definitions with professional dot leaders and proper a
 import re
 import sys
 import os
+from copy import deepcopy
 from pathlib import Path
 from docx import Document
-from docx.shared import Inches
-from docx.enum.text import WD_TAB_ALIGNMENT, WD_TAB_LEADER
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, nsmap, qn
+from docx.text.paragraph import Paragraph
+from lxml import etree
 import argparse
 
+# Optional: RE2 matches in linear time, so very long dot/space runs can't trigger backtracking
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 # Fix Windows encoding issues
 if os.name == 'nt':  # Windows
     import codecs
     sys.stdout = codecs.getwriter('utf-8')(sys.stdout.detach())
     sys.stderr = codecs.getwriter('utf-8')(sys.stderr.detach())
 
+# RE2's \s and \d are ASCII-only; these match the same characters as Python's Unicode classes
+_RE2_SPACE = r'\t-\r\x1c-\x1f\x85\p{Z}'
+_RE2_DIGIT = r'\p{Nd}'
+
+# re is faster on ordinary lines; RE2 only pays off once a line is long enough to backtrack badly
+_RE2_MIN_LENGTH = 500
+
+def _compile(pattern):
+    """
+    Compile a case-insensitive pattern with re, plus an RE2 version for long lines if RE2 is installed.
+    Returns (re_pattern, re2_pattern_or_None); use _pattern_for() to pick one.
+    """
+    compiled = re.compile(pattern, re.IGNORECASE)
+    if re2 is None:
+        return compiled, None
+    
+    def widen(match):
+        token = match.group()
+        if token.startswith('['):
+            return token.replace(r'\s', _RE2_SPACE).replace(r'\d', _RE2_DIGIT)
+        return {r'\s': f'[{_RE2_SPACE}]', r'\d': _RE2_DIGIT}.get(token, token)
+    
+    return compiled, re2.compile('(?i)' + re.sub(r'\[[^\]]*\]|\\.', widen, pattern))
+
+def _pattern_for(patterns, text):
+    """
+    Pick the RE2 pattern for long lines when available, otherwise the re pattern.
+    """
+    compiled, compiled_re2 = patterns
+    if compiled_re2 is not None and len(text) > _RE2_MIN_LENGTH:
+        return compiled_re2
+    return compiled
+
+# Patterns are compiled once at import time instead of on every paragraph
+_ROMAN_CHARS = 'ivxlcdmIVXLCDM'
+_PAGE_SUFFIX_RE = _compile(r'[\.…\s→]+\s*([ivxlcdm]+|\d+)\s*$')
+
+# Character sets for plain str.strip() cleanup; whitespace matches what \s matches
+_WHITESPACE = ''.join(chr(c) for c in range(0x3001) if chr(c).isspace())
+_ARROW_CHARS = '→' + _WHITESPACE
+_LEADER_CHARS = '.…' + _WHITESPACE
+
+# Characters allowed in an acronym; translate() leaves anything else behind
+_ACRONYM_ALLOWED = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-β'
+_ACRONYM_DELETE = str.maketrans('', '', _ACRONYM_ALLOWED)
+
+# Headings that always sit at the top level of the TOC (matched as prefixes)
+_MAIN_KEYWORDS = (
+    'CHAPTER', 'ABSTRACT', 'INTRODUCTION', 'METHODS', 'RESULTS', 
+    'DISCUSSION', 'CONCLUSION', 'REFERENCES', 'ACKNOWLEDGEMENTS', 
+    'CITATION', 'DEDICATION', 'LIST OF', 'SUPPORTING MATERIAL', 
+    'COMPREHENSIVE', 'MATHEMATICAL'
+)
+
+# Existing Word indentation (in EMU) that marks a level 1 (0.3") or level 2 (1.0") entry
+_LEVEL_1_INDENT_EMU = 274320
+_LEVEL_2_INDENT_EMU = 914400
+
+# Paragraph layout applied to entries: 0.25" (360 twips) per indent level,
+# right-aligned dot-leader tab for page numbers at 6.5" (9360 twips)
+_INDENT_TWIPS = {level: str(level * 360) for level in range(4)}
+_TOC_TABS = parse_xml(
+    '<w:tabs %s><w:tab w:pos="9360" w:val="right" w:leader="dot"/></w:tabs>' % nsdecls('w')
+)
+_W_LINE = qn('w:line')
+_W_LINE_RULE = qn('w:lineRule')
+_W_AFTER = qn('w:after')
+_W_BEFORE = qn('w:before')
+_W_LEFT = qn('w:left')
+_W_FIRST_LINE = qn('w:firstLine')
+_W_HANGING = qn('w:hanging')
+_W_P = qn('w:p')
+_W_PPR = qn('w:pPr')
+_W_R = qn('w:r')
+_W_T = qn('w:t')
+_W_TAB = qn('w:tab')
+_W_BR = qn('w:br')
+_XML_SPACE = qn('xml:space')
+_RUN_BREAK_RE = re.compile(r'([\t\r\n])')
+# python-docx 0.8.x reads paragraph text from direct runs only; 1.x also reads hyperlink runs
+_RUN_TEXT_XPATH = etree.XPath('./w:r/w:t', namespaces={'w': nsmap['w']})
+_LINKED_RUN_TEXT_XPATH = etree.XPath('./w:r/w:t | ./w:hyperlink/w:r/w:t', namespaces={'w': nsmap['w']})
+
+# Title and page number separated by dot leaders, a run of spaces, or a single space
+_EXTRACT_RE = _compile(
+    r'^(?P<title>.+?)(?:[\.…]{2,}\s*|[\.…\s]{3,}|\s{2,}|\s+)(?P<page>[ivxlcdm]+|\d+)\s*$'
+)
+
+def _is_page_token(token):
+    """
+    Check if a word is a page number: all digits or all roman numeral letters.
+    """
+    return token.isdecimal() or (token != '' and not token.strip(_ROMAN_CHARS))
+
+def _may_be_toc_text(text_elements):
+    """
+    Cheap pre-filter on raw <w:t> elements: entries end with a page number,
+    abbreviations contain a colon.
+    """
+    raw_text = ''.join(t.text or '' for t in text_elements).rstrip()
+    if not raw_text:
+        return False
+    
+    last_char = raw_text[-1]
+    return last_char in _ROMAN_CHARS or last_char.isdecimal() or ':' in raw_text
+
+def _fast_set_text(paragraph, text):
+    """
+    Replace a paragraph's content with a single plain run, like `paragraph.text = text`
+    but with one pass over the children instead of python-docx's per-run teardown.
+    """
+    p = paragraph._p
+    for child in list(p.iterchildren(tag=etree.Element)):
+        if child.tag != _W_PPR:
+            p.remove(child)
+    
+    # Tabs and line breaks become their own elements, as python-docx does
+    r = etree.SubElement(p, _W_R)
+    for part in _RUN_BREAK_RE.split(text):
+        if part == '\t':
+            etree.SubElement(r, _W_TAB)
+        elif part in ('\r', '\n'):
+            etree.SubElement(r, _W_BR)
+        elif part:
+            t = etree.SubElement(r, _W_T)
+            t.text = part
+            if len(part.strip()) < len(part):
+                t.set(_XML_SPACE, 'preserve')
+
 class TOCFormatter:
-    def __init__(self, input_file, output_file=None):
+    def __init__(self, input_file, output_file=None, verbose=False, max_gap=None):
         self.input_file = Path(input_file)
         self.output_file = Path(output_file) if output_file else self.input_file.with_stem(f"{self.input_file.stem}_formatted")
         self.doc = Document(self.input_file)
+        self.verbose = verbose
+        self.max_gap = max_gap
         
     def is_abbreviation_definition(self, text):
         """
         Check if this line is an abbreviation definition.
+        Returns (acronym, definition) if it is, otherwise None.
         """
         if ':' not in text:
-            return False
+            return None
             
         parts = text.split(':', 1)
         if len(parts) != 2:
-            return False
+            return None
             
         acronym_part = parts[0].strip()
         definition_part = parts[1].strip()
@@ -43,156 +184,136 @@ class TOCFormatter:
         # Pattern to match acronyms (including special characters like β, hyphens, numbers)
         # Using separate character checks to avoid regex syntax issues
         if not (2 <= len(acronym_part) <= 15):
-            return False
+            return None
             
         # Check if acronym starts with letter and contains only valid characters
         if not acronym_part[0].isalpha():
-            return False
+            return None
             
-        valid_chars = set('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-β')
-        if not all(c in valid_chars for c in acronym_part):
-            return False
+        if acronym_part.translate(_ACRONYM_DELETE):
+            return None
         
         # Check if definition part has dots (indicating it's a messy abbreviation line)
-        has_dots = '…' in definition_part or '.' in definition_part
+        if '…' not in definition_part and '.' not in definition_part:
+            return None
         
-        return has_dots
+        return acronym_part, definition_part
     
-    def is_toc_line(self, paragraph):
+    def is_toc_line(self, text):
         """
-        Detect if a paragraph is a TOC entry or abbreviation definition.
+        Detect if a paragraph's text is a TOC entry or abbreviation definition.
+        Returns (is_toc, abbreviation), where abbreviation is the (acronym, definition)
+        pair from is_abbreviation_definition, so callers don't repeat the check.
         """
-        text = paragraph.text.strip()
+        text = text.strip()
         if not text or len(text) < 5:
-            return False
+            return False, None
         
         # Check if this is an abbreviation definition
-        if self.is_abbreviation_definition(text):
-            return True
+        if ':' in text:
+            abbreviation = self.is_abbreviation_definition(text)
+            if abbreviation:
+                return True, abbreviation
         
         # Check for regular TOC entries (must end with page number or roman numeral)
-        page_pattern = r'([ivxlcdm]+|\d+)\s*$'
-        if re.search(page_pattern, text, re.IGNORECASE):
-            # Must have reasonable title length
-            title_part = re.sub(r'[\.…\s→]+\s*([ivxlcdm]+|\d+)\s*$', '', text, flags=re.IGNORECASE)
-            title_part = re.sub(r'^[→\s]+', '', title_part)
-            
-            if len(title_part.strip()) >= 3:
-                return True
+        last_char = text[-1]
+        if last_char not in _ROMAN_CHARS and not last_char.isdecimal():
+            return False, None
         
-        return False
+        # Must have reasonable title length
+        title_part = _pattern_for(_PAGE_SUFFIX_RE, text).sub('', text)
+        title_part = title_part.lstrip(_ARROW_CHARS)
+        
+        if len(title_part.strip()) >= 3:
+            return True, None
+        
+        return False, None
+    
+    def extract_abbreviation_components(self, acronym, definition):
+        """
+        Clean up the acronym and definition found by is_abbreviation_definition.
+        """
+        # Remove all dots and extra spaces around the definition
+        return acronym, definition.strip(_LEADER_CHARS)
     
     def extract_toc_components(self, text):
         """
-        Extract title and page number from TOC line, or acronym and definition from abbreviation.
+        Extract title and page number from a regular TOC line.
         """
         text = text.strip()
         
         if len(text) < 3:
-            return text, "", False
-        
-        # Check if this is an abbreviation definition first
-        if self.is_abbreviation_definition(text):
-            parts = text.split(':', 1)
-            acronym_part = parts[0].strip()
-            definition_part = parts[1].strip()
-            
-            # Clean up the definition part - remove all dots and extra spaces
-            clean_definition = re.sub(r'^[\.…\s]+', '', definition_part)
-            clean_definition = re.sub(r'[\.…\s]+$', '', clean_definition)
-            
-            return acronym_part, clean_definition, True
+            return text, ""
         
         # Remove leading arrows and dots for regular TOC entries
-        text = re.sub(r'^[→\s]+', '', text)
-        text = re.sub(r'^[\.…]+\s*', '', text)
-        
-        # Try different patterns to extract title and page number
-        patterns = [
-            r'^(.+?)[\.…]{2,}\s*([ivxlcdm]+|\d+)\s*$',
-            r'^(.+?)[\.…\s]{3,}([ivxlcdm]+|\d+)\s*$',
-            r'^(.+?)\s{2,}([ivxlcdm]+|\d+)\s*$',
-            r'^(.+?)\s+([ivxlcdm]+|\d+)\s*$'
-        ]
+        text = text.lstrip(_ARROW_CHARS)
+        text = text.lstrip('.…').lstrip()
         
-        for pattern in patterns:
-            match = re.match(pattern, text, re.IGNORECASE)
-            if match:
-                title = match.group(1).strip()
-                page_num = match.group(2).strip()
-                
-                # Clean title
-                title = re.sub(r'[\.…\s]+$', '', title)
-                title = re.sub(r'→+', '', title).strip()
-                
-                # Validate
-                if len(title) >= 2 and len(page_num) <= 6:
-                    page_pattern = r'^([ivxlcdm]+|\d+)$'
-                    if re.match(page_pattern, page_num, re.IGNORECASE):
-                        return title, page_num, False
+        # Extract title and page number
+        match = _pattern_for(_EXTRACT_RE, text).match(text)
+        if match:
+            title = match.group('title').strip()
+            page_num = match.group('page').strip()
+            
+            # Clean title
+            title = title.rstrip(_LEADER_CHARS)
+            title = title.replace('→', '').strip()
+            
+            # Validate
+            if len(title) >= 2 and len(page_num) <= 6:
+                if _is_page_token(page_num):
+                    return title, page_num
         
         # Fallback: last word as page number
         words = text.split()
         if words:
             last_word = words[-1].strip()
-            page_pattern = r'^([ivxlcdm]+|\d+)$'
-            if re.match(page_pattern, last_word, re.IGNORECASE) and len(last_word) <= 6:
+            if _is_page_token(last_word) and len(last_word) <= 6:
                 page_num = last_word
                 title = ' '.join(words[:-1]).strip()
                 
                 if len(title) >= 2:
-                    title = re.sub(r'[\.…→]+\s*$', '', title).strip()
-                    return title, page_num, False
+                    title = title.rstrip('.…→').strip()
+                    return title, page_num
         
-        return text, "", False
+        return text, ""
     
-    def get_indentation_level(self, paragraph):
+    def get_indentation_level(self, text, paragraph_format):
         """
-        Determine indentation level.
+        Determine indentation level from the paragraph's text and Word formatting.
         """
-        text = paragraph.text
+        # Content-based overrides: main sections, tables and figures are always top level,
+        # so their Word formatting doesn't need to be read at all
+        stripped = text.strip()
+        if stripped.upper().startswith(_MAIN_KEYWORDS) or stripped.startswith(('Table ', 'Figure ')):
+            return 0
         
-        # Check Word's paragraph indentation
+        # Check Word's paragraph indentation (takes priority over text-based cues)
         paragraph_indent_level = 0
         try:
-            if hasattr(paragraph.paragraph_format, 'left_indent') and paragraph.paragraph_format.left_indent:
-                indent_inches = paragraph.paragraph_format.left_indent.inches
-                if indent_inches >= 1.0:
+            # Compare the raw EMU value rather than converting to inches
+            left_indent = paragraph_format.left_indent
+            if left_indent:
+                if left_indent.emu >= _LEVEL_2_INDENT_EMU:
                     paragraph_indent_level = 2
-                elif indent_inches >= 0.3:
+                elif left_indent.emu >= _LEVEL_1_INDENT_EMU:
                     paragraph_indent_level = 1
         except:
             pass
         
-        # Count arrow characters
-        leading_arrows = 0
-        i = 0
-        while i < len(text):
-            if text[i] == '→':
-                leading_arrows += 1
-                i += 1
-            elif text[i] in ' \t':
-                i += 1
-            else:
-                break
-        
-        # Count tabs
-        tab_count = 0
-        for char in text:
-            if char == '\t':
-                tab_count += 1
-            elif char != ' ':
-                break
+        if paragraph_indent_level > 0:
+            return paragraph_indent_level
         
-        # Count spaces
-        leading_spaces = len(text) - len(text.lstrip(' '))
+        # Count leading arrows, tabs and spaces (lstrip/count run in C, no per-character loop)
+        prefix = text[:len(text) - len(text.lstrip('→\t '))]
+        leading_arrows = prefix.count('→')
+        tab_count = prefix.count('\t')
+        leading_spaces = prefix.count(' ')
         
         # Determine final level
         final_level = 0
         
-        if paragraph_indent_level > 0:
-            final_level = paragraph_indent_level
-        elif leading_arrows > 0:
+        if leading_arrows > 0:
             final_level = min(leading_arrows, 3)
         elif tab_count > 0:
             final_level = min(tab_count, 3)
@@ -201,24 +322,6 @@ class TOCFormatter:
         elif leading_spaces >= 4:
             final_level = 1
         
-        # Content-based overrides for main sections
-        stripped = text.strip()
-        main_keywords = [
-            'CHAPTER', 'ABSTRACT', 'INTRODUCTION', 'METHODS', 'RESULTS', 
-            'DISCUSSION', 'CONCLUSION', 'REFERENCES', 'ACKNOWLEDGEMENTS', 
-            'CITATION', 'DEDICATION', 'LIST OF', 'SUPPORTING MATERIAL', 
-            'COMPREHENSIVE', 'MATHEMATICAL'
-        ]
-        
-        for keyword in main_keywords:
-            if stripped.upper().startswith(keyword):
-                final_level = 0
-                break
-        
-        # Tables and Figures override
-        if stripped.startswith(('Table ', 'Figure ')):
-            final_level = 0
-        
         return final_level
     
     def format_toc_paragraph(self, paragraph, title, page_num_or_definition, indent_level, is_abbreviation=False):
@@ -228,36 +331,36 @@ class TOCFormatter:
         try:
             if is_abbreviation:
                 # Abbreviation: "ACRONYM: \t Definition" with dot leaders aligned to the right
-                paragraph.text = f"{title}:\t{page_num_or_definition}"
-                tab_position = 6.5  # Same position as TOC entries for consistent alignment
-                alignment = WD_TAB_ALIGNMENT.RIGHT
+                _fast_set_text(paragraph, f"{title}:\t{page_num_or_definition}")
             else:
                 # Regular TOC entry: "Title \t PageNum"
-                paragraph.text = f"{title}\t{page_num_or_definition}"
-                tab_position = 6.5  # Position for page numbers
-                alignment = WD_TAB_ALIGNMENT.RIGHT
+                _fast_set_text(paragraph, f"{title}\t{page_num_or_definition}")
             
             # Set indentation (abbreviations get no indentation)
             if is_abbreviation:
-                base_indent = 0
+                left_indent = '0'
             else:
-                base_indent = indent_level * 0.25
+                left_indent = _INDENT_TWIPS[indent_level]
+            
+            # Edit <w:pPr> directly rather than through python-docx's property setters;
+            # other paragraph properties (style, numbering, alignment) are left in place
+            pPr = paragraph._p.get_or_add_pPr()
             
-            paragraph.paragraph_format.left_indent = Inches(base_indent)
-            paragraph.paragraph_format.first_line_indent = Inches(0)
+            # Replace tab stops with a single right-aligned dot leader
+            pPr._remove_tabs()
+            pPr._insert_tabs(deepcopy(_TOC_TABS))
             
-            # Clear and set tab stops with dot leaders
-            paragraph.paragraph_format.tab_stops.clear_all()
-            paragraph.paragraph_format.tab_stops.add_tab_stop(
-                Inches(tab_position),
-                alignment,
-                WD_TAB_LEADER.DOTS
-            )
+            # Single line spacing, no space before/after
+            spacing = pPr.get_or_add_spacing()
+            spacing.set(_W_LINE, '240')
+            spacing.set(_W_LINE_RULE, 'auto')
+            spacing.set(_W_AFTER, '0')
+            spacing.set(_W_BEFORE, '0')
             
-            # Set line spacing
-            paragraph.paragraph_format.line_spacing = 1.0
-            paragraph.paragraph_format.space_after = Inches(0)
-            paragraph.paragraph_format.space_before = Inches(0)
+            ind = pPr.get_or_add_ind()
+            ind.set(_W_LEFT, left_indent)
+            ind.attrib.pop(_W_HANGING, None)
+            ind.set(_W_FIRST_LINE, '0')
                 
         except Exception as e:
             print(f"    Warning: Could not format paragraph: {e}")
@@ -266,6 +369,14 @@ class TOCFormatter:
             else:
                 paragraph.text = f"{title}\t{page_num_or_definition}"
     
+    def is_candidate_paragraph(self, p):
+        """
+        Cheap check on a <w:p> element's raw run text, done before building a Paragraph wrapper.
+        """
+        # Keep the paragraph if either reading of its text could match, so the filter
+        # never drops an entry whichever python-docx version builds paragraph.text
+        return _may_be_toc_text(_RUN_TEXT_XPATH(p)) or _may_be_toc_text(_LINKED_RUN_TEXT_XPATH(p))
+    
     def process_document(self):
         """
         Process the entire document.
@@ -274,34 +385,81 @@ class TOCFormatter:
         
         print(f"Processing: {self.input_file.name}")
         
-        for paragraph in self.doc.paragraphs:
-            if self.is_toc_line(paragraph):
-                original_text = paragraph.text
-                title, page_num_or_definition, is_abbrev = self.extract_toc_components(original_text)
-                
-                if title and page_num_or_definition:
-                    if is_abbrev:
-                        # Abbreviation definition
-                        self.format_toc_paragraph(paragraph, title, page_num_or_definition, 0, is_abbreviation=True)
-                        toc_count += 1
-                        print(f"  Formatted: {title}: {page_num_or_definition[:40]} (abbreviation)")
-                    else:
-                        # Regular TOC entry with page number
-                        indent_level = self.get_indentation_level(paragraph)
-                        self.format_toc_paragraph(paragraph, title, page_num_or_definition, indent_level, is_abbreviation=False)
-                        toc_count += 1
-                        
-                        indent_indicator = "  " * indent_level
-                        print(f"  Formatted: {indent_indicator}{title[:40]} -> {page_num_or_definition} (level {indent_level})")
-                elif title:
-                    print(f"  Formatted: {title[:60]} (header)")
-                    toc_count += 1
-                else:
-                    print(f"  Skipped: {original_text[:60]}")
+        # Index of the last TOC line seen; used to stop once the TOC is well behind us
+        last_toc_index = None
+        stopped_gap = None
+        
+        body = self.doc._body
+        for index, p in enumerate(self.doc.element.body.iterchildren(_W_P)):
+            # Checked for every body paragraph, so the walk ends even if nothing later passes the filter
+            if self.max_gap is not None and last_toc_index is not None:
+                gap = index - last_toc_index - 1
+                if gap > self.max_gap:
+                    stopped_gap = gap
+                    break
+            
+            if not self.is_candidate_paragraph(p):
+                continue
+            
+            paragraph = Paragraph(p, body)
+            original_text = paragraph.text
+            
+            # Detection only reads text; formatting is the step that edits the document
+            result = self.classify_paragraph(original_text)
+            if result is not None:
+                last_toc_index = index
+                toc_count += self.format_classified_paragraph(paragraph, original_text, *result)
+        
+        if stopped_gap is not None:
+            print(f"Stopped after {stopped_gap} paragraphs without entries, more than --max-gap {self.max_gap} "
+                  f"(use --full-scan to scan the whole document)")
         
         print(f"\nFormatted {toc_count} entries")
         return toc_count
     
+    def classify_paragraph(self, text):
+        """
+        Classify a paragraph's text without touching the document.
+        Returns (title, page_num_or_definition, is_abbreviation), or None if it isn't a TOC line.
+        """
+        is_toc, abbreviation = self.is_toc_line(text)
+        if not is_toc:
+            return None
+        
+        if abbreviation is not None:
+            return (*self.extract_abbreviation_components(*abbreviation), True)
+        
+        return (*self.extract_toc_components(text), False)
+    
+    def format_classified_paragraph(self, paragraph, original_text, title, page_num_or_definition, is_abbrev):
+        """
+        Format one classified paragraph. Returns 1 if it counts as a formatted entry, else 0.
+        """
+        if title and page_num_or_definition:
+            if is_abbrev:
+                # Abbreviation definition
+                self.format_toc_paragraph(paragraph, title, page_num_or_definition, 0, is_abbreviation=True)
+                if self.verbose:
+                    print(f"  Formatted: {title}: {page_num_or_definition[:40]} (abbreviation)")
+            else:
+                # Regular TOC entry with page number
+                indent_level = self.get_indentation_level(original_text, paragraph.paragraph_format)
+                self.format_toc_paragraph(paragraph, title, page_num_or_definition, indent_level, is_abbreviation=False)
+                
+                if self.verbose:
+                    indent_indicator = "  " * indent_level
+                    print(f"  Formatted: {indent_indicator}{title[:40]} -> {page_num_or_definition} (level {indent_level})")
+            return 1
+        
+        if title:
+            if self.verbose:
+                print(f"  Formatted: {title[:60]} (header)")
+            return 1
+        
+        if self.verbose:
+            print(f"  Skipped: {original_text[:60]}")
+        return 0
+    
     def save(self):
         """
         Save the document.
@@ -314,11 +472,26 @@ class TOCFormatter:
             print(f"Error saving file: {e}")
             return False
 
+def _non_negative_int(value):
+    """
+    argparse type for counts that can't be negative.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {number}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description="Format table of contents and abbreviations in Word documents")
     parser.add_argument('input_file', help='Input Word document (.docx)')
     parser.add_argument('-o', '--output', help='Output file (default: input_formatted.docx)')
     parser.add_argument('--backup', action='store_true', help='Create backup of original file')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print each formatted entry')
+    parser.add_argument('--max-gap', type=_non_negative_int, default=200, help='Stop after this many paragraphs without a TOC line once one is found (default: 200)')
+    parser.add_argument('--full-scan', action='store_true', help='Scan the whole document, even long after the TOC ends')
     
     args = parser.parse_args()
     
@@ -344,7 +517,8 @@ def main():
     
     # Process document
     try:
-        formatter = TOCFormatter(args.input_file, args.output)
+        formatter = TOCFormatter(args.input_file, args.output, verbose=args.verbose,
+                                 max_gap=None if args.full_scan else args.max_gap)
         count = formatter.process_document()
         
         if count > 0: